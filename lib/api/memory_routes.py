@@ -1,15 +1,48 @@
-from fastapi import APIRouter, Depends
-from typing import Dict, List
+from contextlib import asynccontextmanager
+import anyio
+from fastapi import APIRouter, Depends, FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
+from typing import Dict, List, Optional
 from .memory_service import MemoryService
 
-router = APIRouter()
-memory_service = MemoryService()
+class StatusResponse(BaseModel):
+    status: str
 
-@router.post("/memories")
+class MemoryHit(BaseModel):
+    # Lets memory objects be returned directly without building dicts first
+    model_config = ConfigDict(from_attributes=True)
+
+    id: Optional[str] = None
+    # LangChain Documents carry the text as page_content, mem0 hits as memory
+    content: str = Field(validation_alias=AliasChoices("content", "page_content", "memory"))
+    metadata: Optional[Dict] = {}
+    score: Optional[float] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Milvus and mem0 clients are sync and run in worker threads; the default
+    # 40-thread limiter saturates under concurrent requests
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 200
+    # Build the service once per process instead of at import time
+    app.state.memory_service = MemoryService()
+    yield
+    await app.state.memory_service.close()
+
+def get_memory_service(request: Request) -> MemoryService:
+    return request.app.state.memory_service
+
+# FastAPI merges router lifespans into the app on include_router from 0.112.2
+# (pinned in pyproject.toml); apps on older releases must pass lifespan=lifespan
+# to FastAPI() themselves
+router = APIRouter(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+@router.post("/memories", response_model=StatusResponse)
 async def add_memory(
     user_id: str,
     content: str,
-    metadata: Dict = None
+    metadata: Dict = None,
+    memory_service: MemoryService = Depends(get_memory_service)
 ):
     await memory_service.add_user_memory(
         user_id=user_id,
@@ -18,11 +51,12 @@ async def add_memory(
     )
     return {"status": "success"}
 
-@router.get("/memories/search")
+@router.get("/memories/search", response_model=List[MemoryHit])
 async def search_memories(
     user_id: str,
     query: str,
-    limit: int = 5
+    limit: int = 5,
+    memory_service: MemoryService = Depends(get_memory_service)
 ):
     results = await memory_service.retrieve_memories(
         user_id=user_id,
@@ -31,11 +65,12 @@ async def search_memories(
     )
     return results
 
-@router.get("/memories/context")
+@router.get("/memories/context", response_model=List[MemoryHit])
 async def get_context(
     user_id: str,
     query: str,
-    limit: int = 5
+    limit: int = 5,
+    memory_service: MemoryService = Depends(get_memory_service)
 ):
     context = await memory_service.get_context(
         user_id=user_id,
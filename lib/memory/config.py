@@ -3,7 +3,7 @@ const DEFAULT_CONFIG = {
         url: "http://localhost:19530",
         collection_name: "mem0",
         embedding_model_dims: 1536,
-        metric_type: "L2"
+        metric_type: "IP"
     },
     neo4j: {
         url: "bolt://localhost:7687",
@@ -1,6 +1,6 @@
 # Update __init__.py to include new components:
 """Memory management module initialization."""
-from .base_classes import BaseMessage, ChatMessage
+from .base_classes import BaseMessage, ChatMessage, MessageBatch
 from .initialization_config import EnhancedMemoryManager
 from .core_functions import MemoryCoreFunctions
 from .storage_operations import StorageOperations
@@ -12,10 +12,14 @@ from .memory_summarizer import MemorySummarizer
 from .memory_validator import MemoryValidator
 from .memory_compressor import MemoryCompressor
 from .memory_cache import MemoryCache
+from .embedding_cache import EmbeddingCache
+from .embedding_batcher import EmbeddingBatcher
+from .semantic_cache import SemanticCache
 
 __all__ = [
     'BaseMessage',
     'ChatMessage', 
+    'MessageBatch',
     'EnhancedMemoryManager',
     'MemoryCoreFunctions',
     'StorageOperations',
@@ -26,5 +30,8 @@ __all__ = [
     'MemorySummarizer',
     'MemoryValidator',
     'MemoryCompressor',
-    'MemoryCache'
+    'MemoryCache',
+    'EmbeddingCache',
+    'EmbeddingBatcher',
+    'SemanticCache'
 ]
\ No newline at end of file
@@ -1,4 +1,6 @@
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+import numpy as np
 from langchain.schema import BaseMessage as LangChainBaseMessage
 from mem0.memory.main import Memory as Mem0Memory
 
@@ -9,7 +11,55 @@ class BaseMessage(LangChainBaseMessage):
         
 class ChatMessage(BaseMessage):
     """Chat message implementation"""
-    type = "chat"
+    type: str = "chat"
     
     def __init__(self, content: str, role: str, metadata: Optional[Dict] = None):
-        super().__init__(content=content, additional_kwargs={"role": role, "metadata": metadata})
\ No newline at end of file
+        super().__init__(content=content, additional_kwargs={"role": role, "metadata": metadata})
+
+class MessageBatch:
+    """Columnar (struct-of-arrays) view over a collection of messages"""
+    def __init__(self, contents: List[str], creators: List[Optional[str]], timestamps_ns: np.ndarray):
+        self.contents = contents
+        self.creators = creators
+        self.timestamps_ns = timestamps_ns
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    @classmethod
+    def from_messages(cls, messages: List[Union[Dict, LangChainBaseMessage]]) -> "MessageBatch":
+        contents = []
+        creators = []
+        timestamps = []
+        for msg in messages:
+            if isinstance(msg, LangChainBaseMessage):
+                extra = msg.additional_kwargs or {}
+                metadata = extra.get("metadata") or {}
+                contents.append(msg.content)
+                creators.append(extra.get("role"))
+            else:
+                metadata = msg.get("metadata") or {}
+                # mem0 search hits carry their text under "memory"
+                contents.append(str(msg.get("content", msg.get("memory", ""))))
+                creators.append(msg.get("role") or metadata.get("user_id"))
+            timestamps.append(cls._to_ns(msg.get("timestamp") if isinstance(msg, dict) else None, metadata))
+        return cls(contents, creators, np.asarray(timestamps, dtype=np.int64))
+
+    def to_dicts(self) -> List[Dict]:
+        return [
+            {"content": content, "creator": creator, "timestamp_ns": int(ts)}
+            for content, creator, ts in zip(self.contents, self.creators, self.timestamps_ns)
+        ]
+
+    @staticmethod
+    def _to_ns(timestamp, metadata: Dict) -> int:
+        if timestamp is None:
+            timestamp = metadata.get("timestamp")
+        if isinstance(timestamp, (int, float)):
+            return int(timestamp * 1_000_000_000)
+        if isinstance(timestamp, str):
+            try:
+                return int(datetime.fromisoformat(timestamp).timestamp() * 1_000_000_000)
+            except ValueError:
+                return 0
+        return 0
\ No newline at end of file
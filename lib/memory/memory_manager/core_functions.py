@@ -1,11 +1,42 @@
+import asyncio
+import logging
+from functools import partial
+from typing import Dict, Optional
+import anyio
+import orjson
+import xxhash
+from .memory_context_manager import MemoryContextManager
+from .memory_validator import MemoryValidator
+from .memory_cache import MemoryCache
+
+logger = logging.getLogger(__name__)
+
+GATEKEEPER_PROMPT = """
+You decide whether a memory lookup is needed to answer the user's latest query.
+You are given the most recent conversation context and the query.
+
+Respond with a JSON object:
+{"continue": bool, "content": str, "top_k": int}
+
+- "continue": false if the context already answers the query or the query is
+  small talk/acknowledgement that needs no memories, otherwise true
+- "content": when "continue" is false, the answer drawn from the context
+- "top_k": how many memories to retrieve when "continue" is true (1-20)
+"""
+
 class MemoryCoreFunctions:
     def __init__(self, config: Dict):
         self.config = config
         self.mem0 = config['mem0']
+        self.llm = config.get('llm')
         # Add new components
-        self.context_manager = MemoryContextManager()
+        self.context_manager = MemoryContextManager(embeddings=config.get('embeddings'))
         self.validator = MemoryValidator()
-        self.cache = MemoryCache()
+        # Search results aren't evicted when memories are added, and the Redis
+        # tier is shared across workers, so keep them short-lived
+        self.cache = MemoryCache(ttl_seconds=60, redis_url=config.get('redis_url'))
+        # Searches currently running, keyed by all search arguments
+        self._inflight: Dict[bytes, asyncio.Future] = {}
         
     async def perform_operation(self, operation: str, **kwargs):
         try:
@@ -20,11 +51,11 @@ class MemoryCoreFunctions:
                     
             # Check cache first
             if operation == 'search':
-                cached_result = await self.cache.get_cached_memory(
-                    kwargs.get('query')
-                )
+                search_key = self._search_key(kwargs)
+                cached_result = await self.cache.get_cached_memory(search_key.hex())
                 if cached_result:
                     return cached_result
+                return await self._search_single_flight(search_key, **kwargs)
                     
             # Update context
             if operation == 'add':
@@ -34,17 +65,89 @@ class MemoryCoreFunctions:
                 }])
                 
             # Perform original operation
-            result = await super().perform_operation(operation, **kwargs)
-            
-            # Cache results if applicable
-            if operation == 'search':
-                await self.cache.cache_memory(
-                    kwargs.get('query'),
-                    result
-                )
-                
-            return result
+            return await super().perform_operation(operation, **kwargs)
             
         except Exception as e:
             capture_event(f"error.memory.{operation}", {"error": str(e)})
-            raise
\ No newline at end of file
+            raise
+            
+    async def _gatekeeper(self, query: str, user_id: Optional[str]) -> Optional[Dict]:
+        """
+        Asks the LLM whether the caller's recent context already answers the query
+        """
+        # The context window is shared by every user's adds; only the caller's
+        # own messages may be used, so without a user_id always search
+        if self.llm is None or not query or user_id is None:
+            return None
+        recent_messages = [
+            m for m in self.context_manager.context_window
+            if isinstance(m, dict) and (m.get('metadata') or {}).get('user_id') == user_id
+        ][-4:]
+        # With no context the answer can only come from a search
+        if not recent_messages:
+            return None
+        try:
+            recent_context = "\n".join(str(m) for m in recent_messages)
+            response = await anyio.to_thread.run_sync(partial(
+                self.llm.generate_response,
+                messages=[
+                    {"role": "system", "content": GATEKEEPER_PROMPT},
+                    {"role": "user", "content": f"Context:\n{recent_context}\n\nQuery: {query}"}
+                ],
+                response_format={"type": "json_object"}
+            ))
+            gate = orjson.loads(response)
+            # Anything but a JSON object means a malformed answer; just search
+            return gate if isinstance(gate, dict) else None
+            
+        except Exception as e:
+            # On any failure fall back to a normal search
+            logger.error(f"Gatekeeper error: {str(e)}")
+            return None
+            
+    @staticmethod
+    def _clamp_top_k(top_k) -> Optional[int]:
+        try:
+            return max(1, min(20, int(top_k)))
+        except (TypeError, ValueError):
+            return None
+            
+    @staticmethod
+    def _search_key(kwargs: Dict) -> bytes:
+        # Every forwarded argument (limit, filters, ...) can change the result
+        return xxhash.xxh3_128(orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS, default=str)).digest()
+            
+    async def _search_single_flight(self, key: bytes, **kwargs):
+        """
+        Runs a search, letting concurrent identical searches await the same result
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._search(key, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            
+        # Shield so one caller cancelling doesn't cancel the shared search
+        return await asyncio.shield(task)
+            
+    async def _search(self, key: bytes, **kwargs):
+        """
+        Gatekeeper check, then the underlying search; runs once per single flight
+        """
+        # Skip the vector/graph round trips when recent context suffices
+        gate = await self._gatekeeper(kwargs.get('query'), (kwargs.get('filters') or {}).get('user_id'))
+        if gate is not None:
+            if gate.get('continue') is False and gate.get('content'):
+                # Same shape as search hits so callers needn't special-case it.
+                # Not cached: the answer depends on the current context window
+                return [{
+                    'content': str(gate['content']),
+                    'metadata': {'source': 'context_window'}
+                }]
+            top_k = self._clamp_top_k(gate.get('top_k'))
+            if top_k is not None:
+                kwargs.setdefault('limit', top_k)
+                
+        result = await super().perform_operation('search', **kwargs)
+        await self.cache.cache_memory(key.hex(), result)
+        return result
\ No newline at end of file
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from typing import List, Optional
+from langchain.embeddings.base import Embeddings
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embedding requests into one batched call
+    """
+    def __init__(self, embeddings: Embeddings, max_batch_size: int = 32, max_wait_ms: int = 10):
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Requests taken off the queue but not yet answered
+        self._batch: List = []
+
+    async def embed(self, text: str) -> List[float]:
+        """
+        Queues a text and waits for its vector from the next flushed batch
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def close(self):
+        """
+        Stops the background worker and fails requests still waiting on it
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+        pending = list(self._batch)
+        self._batch = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+        self._fail(pending, RuntimeError("EmbeddingBatcher closed"))
+
+    def _ensure_worker(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            self._batch = batch
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                vectors = await self.embeddings.aembed_documents([text for text, _ in batch])
+                if len(vectors) != len(batch):
+                    # Can't tell which texts the vectors belong to
+                    raise ValueError(f"Expected {len(batch)} embeddings, got {len(vectors)}")
+            except Exception as e:
+                logger.error(f"Batched embedding error: {str(e)}")
+                self._fail(batch, e)
+                self._batch = []
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+            self._batch = []
+
+    @staticmethod
+    def _fail(requests: List, error: Exception):
+        for _, future in requests:
+            if not future.done():
+                future.set_exception(error)
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List
+import numpy as np
+import xxhash
+from langchain.embeddings.base import Embeddings
+from .embedding_batcher import EmbeddingBatcher
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache(Embeddings):
+    """
+    Memoizes embedding vectors by content hash in front of a remote embedder
+    """
+    def __init__(self, embeddings: Embeddings, max_size: int = 10000, normalize: bool = True):
+        self.embeddings = embeddings
+        self.max_size = max_size
+        self.normalize = normalize
+        # Async misses from concurrent callers share one Jina request
+        self.batcher = EmbeddingBatcher(embeddings)
+        self.cache = OrderedDict()
+
+    def embed_documents(self, texts: List[str]) -> List[np.ndarray]:
+        keys, vectors, misses = self._lookup(texts, 'document')
+        if misses:
+            embedded = self.embeddings.embed_documents(list(misses.values()))
+            self._store(misses, embedded, vectors)
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> np.ndarray:
+        keys, vectors, misses = self._lookup([text], 'query')
+        if misses:
+            self._store(misses, [self.embeddings.embed_query(text)], vectors)
+        return vectors[keys[0]]
+
+    async def aembed_documents(self, texts: List[str]) -> List[np.ndarray]:
+        keys, vectors, misses = self._lookup(texts, 'document')
+        if misses:
+            embedded = await asyncio.gather(*[self.batcher.embed(text) for text in misses.values()])
+            self._store(misses, embedded, vectors)
+        return [vectors[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> np.ndarray:
+        keys, vectors, misses = self._lookup([text], 'query')
+        if misses:
+            self._store(misses, [await self.batcher.embed(text)], vectors)
+        return vectors[keys[0]]
+
+    def _lookup(self, texts: List[str], kind: str):
+        """
+        Splits texts into cached vectors and the de-duplicated miss set
+        """
+        keys = []
+        vectors: Dict[bytes, np.ndarray] = {}
+        misses: Dict[bytes, str] = {}
+        for text in texts:
+            key = self._make_key(text, kind)
+            keys.append(key)
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                vectors[key] = self.cache[key]
+            else:
+                misses.setdefault(key, text)
+        return keys, vectors, misses
+
+    def _store(self, misses: Dict[bytes, str], embedded: List[List[float]], vectors: Dict):
+        """
+        Records freshly embedded vectors, evicting least recently used entries
+        """
+        # Kept as float32 rows: 4 bytes per dimension in the cache instead of a
+        # boxed Python float, and SemanticCache / MemoryContextManager use them
+        # without copying
+        matrix = np.asarray(embedded, dtype=np.float32)
+        if self.normalize:
+            # Unit-length vectors let Milvus rank by inner product (cosine)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1, norms)
+        # Rows are shared between callers and the cache
+        matrix.setflags(write=False)
+        for key, vector in zip(misses, matrix):
+            vectors[key] = vector
+            self.cache[key] = vector
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+
+    @staticmethod
+    def _make_key(text: str, kind: str) -> bytes:
+        normalized = " ".join(text.split())
+        return xxhash.xxh3_128(f"{kind}:{normalized}".encode('utf-8')).digest()
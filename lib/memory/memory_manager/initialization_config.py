@@ -1,33 +1,89 @@
+from functools import cache, cached_property
 from typing import Dict
 from langchain.llms import GoogleGenerativeAI
 from langchain.embeddings import JinaEmbeddings
 from langchain.vectorstores import Milvus
+from requests.adapters import HTTPAdapter
 from mem0.memory.main import Memory as Mem0Memory
+from .embedding_cache import EmbeddingCache
+
+@cache
+def _build_llm(model_name: str, google_api_key: str):
+    # One client per model and key for the whole process, however many configs
+    return GoogleGenerativeAI(model=model_name, google_api_key=google_api_key)
 
 class InitializationConfig:
     def __init__(self, config: Dict):
         self.config = config
-        self.llm = self._init_llm()
-        self.embeddings = self._init_embeddings()
-        self.vector_store = self._init_vector_store()
-        self.mem0 = self._init_mem0()
+        
+    # Clients are built on first use so read-only callers don't pay for all four
+    @cached_property
+    def llm(self):
+        return self._init_llm()
+    
+    @cached_property
+    def embeddings(self):
+        return self._init_embeddings()
+    
+    @cached_property
+    def vector_store(self):
+        return self._init_vector_store()
+    
+    @cached_property
+    def mem0(self):
+        return self._init_mem0()
         
     def _init_llm(self):
-        return GoogleGenerativeAI(
-            model=self.config.get("model_name", "gemini-pro"),
-            google_api_key=self.config["google_api_key"]
+        return _build_llm(
+            self.config.get("model_name", "gemini-pro"),
+            self.config["google_api_key"]
         )
     
     def _init_embeddings(self):
-        return JinaEmbeddings(
-            api_key=self.config["jina_api_key"]
+        embeddings = JinaEmbeddings(api_key=self.config["jina_api_key"])
+        # Worker threads share this session; size the keep-alive pool to match
+        # so connections are reused instead of re-handshaking TLS per call
+        pool_size = self.config.get("http_pool_size", 50)
+        embeddings.session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        return EmbeddingCache(
+            embeddings,
+            max_size=self.config.get("embedding_cache_size", 10000)
         )
     
     def _init_vector_store(self):
+        index_params, search_params = self._index_params()
         return Milvus(
             connection_args=self.config["milvus_config"],
-            embedding_function=self.embeddings
+            embedding_function=self.embeddings,
+            # Embeddings are L2-normalized, so inner product ranks by cosine similarity
+            index_params={"metric_type": "IP", **index_params},
+            # Default recall/latency trade-off; SearchProcessing.search can override it per query
+            search_params={"metric_type": "IP", "params": search_params}
         )
+
+    def _index_params(self):
+        """
+        Returns index build and default search params for the configured index_type
+        """
+        if self.config.get("index_type", "HNSW") == "IVF_PQ":
+            # Product quantization stores each vector as m bytes instead of
+            # 4 bytes per dimension, at a small recall cost
+            return {
+                "index_type": "IVF_PQ",
+                "params": {
+                    "nlist": self.config.get("ivf_nlist", 1024),
+                    "m": self.config.get("pq_m", 96),
+                    "nbits": self.config.get("pq_nbits", 8)
+                }
+            }, {"nprobe": self.config.get("ivf_nprobe", 16)}
+
+        return {
+            "index_type": "HNSW",
+            "params": {
+                "M": self.config.get("hnsw_m", 32),
+                "efConstruction": self.config.get("hnsw_ef_construction", 200)
+            }
+        }, {"ef": self.config.get("hnsw_ef", 64)}
         
     def _init_mem0(self):
         return Mem0Memory(config=self.config)
\ No newline at end of file
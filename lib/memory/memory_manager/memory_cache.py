@@ -1,62 +1,92 @@
+import asyncio
 import logging
+import time
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from cachetools import TTLCache
+import orjson
+import xxhash
 
 logger = logging.getLogger(__name__)
 
 class MemoryCache:
-    def __init__(self, ttl_seconds: int = 3600):
-        self.cache = {}
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        max_size: int = 1024,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "aivy:memcache:"
+    ):
         self.ttl_seconds = ttl_seconds
-        
+        self.max_size = max_size
+        self.key_prefix = key_prefix
+        # Bounded LRU with monotonic-clock TTL; expired entries are purged lazily.
+        # Integer nanoseconds keep the per-access expiry check an int compare
+        self.cache = TTLCache(maxsize=max_size, ttl=ttl_seconds * 1_000_000_000, timer=time.monotonic_ns)
+        self._lock = asyncio.Lock()
+
+        # Optional process-shared second tier
+        self._l2 = None
+        if redis_url:
+            import redis.asyncio as aioredis
+            self._l2 = aioredis.Redis.from_url(redis_url)
+
     async def get_cached_memory(self, memory_id: str) -> Optional[Dict]:
         """
         Retrieves cached memory if available and not expired
         """
         try:
-            if memory_id in self.cache:
-                cached_item = self.cache[memory_id]
-                if not self._is_expired(cached_item['timestamp']):
-                    return cached_item['data']
-                else:
-                    del self.cache[memory_id]
-            return None
-            
+            async with self._lock:
+                data = self.cache.get(memory_id)
+            if data is not None or self._l2 is None:
+                return data
+
+            raw = await self._l2.get(self._l2_key(memory_id))
+            if raw is None:
+                return None
+            data = orjson.loads(raw)
+            async with self._lock:
+                self.cache[memory_id] = data
+            return data
+
         except Exception as e:
             logger.error(f"Cache retrieval error: {str(e)}")
             return None
-            
+
     async def cache_memory(self, memory_id: str, data: Dict) -> bool:
         """
         Caches memory data with TTL
         """
         try:
-            self.cache[memory_id] = {
-                'data': data,
-                'timestamp': datetime.utcnow()
-            }
+            async with self._lock:
+                self.cache[memory_id] = data
+            if self._l2 is not None:
+                payload = self._l2_payload(data)
+                if payload is not None:
+                    await self._l2.set(self._l2_key(memory_id), payload, ex=self.ttl_seconds)
             return True
         except Exception as e:
             logger.error(f"Cache storage error: {str(e)}")
             return False
-            
-    def _is_expired(self, timestamp: datetime) -> bool:
-        """
-        Checks if cached item has expired
-        """
-        return (datetime.utcnow() - timestamp).total_seconds() > self.ttl_seconds
-        
+
     async def clear_expired(self):
         """
         Removes expired items from cache
         """
         try:
-            current_time = datetime.utcnow()
-            expired_keys = [
-                k for k, v in self.cache.items() 
-                if self._is_expired(v['timestamp'])
-            ]
-            for k in expired_keys:
-                del self.cache[k]
+            async with self._lock:
+                self.cache.expire()
         except Exception as e:
-            logger.error(f"Cache cleanup error: {str(e)}")
\ No newline at end of file
+            logger.error(f"Cache cleanup error: {str(e)}")
+
+    def _l2_key(self, memory_id: str) -> str:
+        # Stable across processes, unlike hash()
+        return self.key_prefix + xxhash.xxh3_128_hexdigest(str(memory_id).encode('utf-8'))
+
+    @staticmethod
+    def _l2_payload(data) -> Optional[bytes]:
+        # Only plain JSON round-trips unchanged; anything else (e.g. Documents)
+        # stays in L1 so an L2 hit never returns a different type than L1
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            return None
\ No newline at end of file
@@ -1,50 +1,160 @@
+import io
 import logging
+import os
+import threading
 from typing import List, Dict, Optional
 import zlib
-import json
+import anyio
+import orjson
+import zstandard
 
 logger = logging.getLogger(__name__)
 
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
 class MemoryCompressor:
-    def __init__(self, compression_level: int = 6):
+    def __init__(
+        self,
+        compression_level: int = 3,
+        dict_path: Optional[str] = None,
+        dict_size: int = 131072,
+        training_samples: int = 2000,
+        threads: int = -1
+    ):
         self.compression_level = compression_level
-        
+        self.threads = threads
+        self.dict_path = dict_path
+        self.dict_size = dict_size
+        self.training_samples = training_samples
+        self._samples: List[bytes] = []
+        self._dict = None
+
+        # Plain contexts until a dictionary is loaded or trained
+        self._cctx = zstandard.ZstdCompressor(level=compression_level, threads=threads)
+        self._dctx = zstandard.ZstdDecompressor()
+        self._dict_dctx = None
+        # zstd contexts are not thread-safe; compression already uses all cores
+        self._lock = threading.Lock()
+
+        self._load_dict()
+
     async def compress_memories(self, memories: List[Dict]) -> Dict:
         """
         Compresses memories for efficient storage
         """
         try:
-            # Convert memories to JSON string
-            memories_json = json.dumps(memories)
-            
-            # Compress the JSON string
-            compressed_data = zlib.compress(
-                memories_json.encode('utf-8'), 
-                level=self.compression_level
-            )
-            
+            # Compression and dictionary training are CPU-bound; keep them off the event loop
+            original_size, compressed_data = await anyio.to_thread.run_sync(self._compress, memories)
+
             compression_stats = {
-                "original_size": len(memories_json),
+                "original_size": original_size,
                 "compressed_size": len(compressed_data),
-                "compression_ratio": len(memories_json) / len(compressed_data)
+                "compression_ratio": original_size / len(compressed_data)
             }
-            
+
             return {
                 "compressed_data": compressed_data,
                 "stats": compression_stats
             }
-            
+
         except Exception as e:
             logger.error(f"Memory compression error: {str(e)}")
             return None
-            
+
     async def decompress_memories(self, compressed_data: bytes) -> List[Dict]:
         """
         Decompresses stored memories
         """
         try:
-            decompressed_data = zlib.decompress(compressed_data)
-            return json.loads(decompressed_data.decode('utf-8'))
+            return await anyio.to_thread.run_sync(self._decompress, compressed_data)
         except Exception as e:
             logger.error(f"Memory decompression error: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    def _compress(self, memories: List[Dict]):
+        """
+        Streams memories as NDJSON through the multi-threaded compressor
+        """
+        original_size = 0
+        buffer = io.BytesIO()
+        with self._lock:
+            # A dictionary that only lives in memory would leave everything
+            # compressed with it unreadable after a restart, so only train one
+            # when it can be persisted
+            if self._dict is None and self.dict_path:
+                self._collect_samples(memories)
+
+            with self._cctx.stream_writer(buffer, closefd=False) as writer:
+                for memory in memories:
+                    line = orjson.dumps(memory) + b"\n"
+                    original_size += len(line)
+                    writer.write(line)
+        return original_size, buffer.getvalue()
+
+    def _decompress(self, compressed_data: bytes) -> List[Dict]:
+        # Data written before the switch to zstd is zlib
+        if not compressed_data.startswith(ZSTD_MAGIC):
+            return orjson.loads(zlib.decompress(compressed_data))
+
+        dict_id = zstandard.get_frame_parameters(compressed_data).dict_id
+        with self._lock:
+            if dict_id:
+                if self._dict is None or dict_id != self._dict.dict_id():
+                    # Another compressor sharing dict_path may have published
+                    # the dictionary after this one started
+                    self._load_dict()
+                if self._dict is None or dict_id != self._dict.dict_id():
+                    raise ValueError(f"Missing compression dictionary {dict_id}")
+                dctx = self._dict_dctx
+            else:
+                dctx = self._dctx
+
+            with dctx.stream_reader(compressed_data) as reader:
+                decompressed_data = reader.read()
+
+        # Single JSON array from before the switch to NDJSON
+        if decompressed_data.startswith(b"["):
+            return orjson.loads(decompressed_data)
+        return [orjson.loads(line) for line in decompressed_data.splitlines() if line]
+
+    def _collect_samples(self, memories: List[Dict]):
+        """
+        Gathers serialized memories and trains a dictionary once enough are seen
+        """
+        self._samples.extend(orjson.dumps(m) for m in memories)
+        if len(self._samples) < self.training_samples:
+            return
+
+        try:
+            trained = zstandard.train_dictionary(self.dict_size, self._samples)
+            # Publish with a no-clobber link so two compressors sharing dict_path
+            # can't each use a different dictionary; the loser adopts the winner's
+            tmp_path = f"{self.dict_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(trained.as_bytes())
+            try:
+                os.link(tmp_path, self.dict_path)
+            except FileExistsError:
+                with open(self.dict_path, 'rb') as f:
+                    trained = zstandard.ZstdCompressionDict(f.read())
+            finally:
+                os.unlink(tmp_path)
+            self._use_dict(trained)
+        except Exception as e:
+            logger.error(f"Compression dictionary training error: {str(e)}")
+        finally:
+            self._samples = []
+
+    def _load_dict(self):
+        if self.dict_path and os.path.exists(self.dict_path):
+            with open(self.dict_path, 'rb') as f:
+                self._use_dict(zstandard.ZstdCompressionDict(f.read()))
+
+    def _use_dict(self, compression_dict):
+        self._dict = compression_dict
+        self._cctx = zstandard.ZstdCompressor(
+            level=self.compression_level,
+            dict_data=compression_dict,
+            threads=self.threads
+        )
+        self._dict_dctx = zstandard.ZstdDecompressor(dict_data=compression_dict)
\ No newline at end of file
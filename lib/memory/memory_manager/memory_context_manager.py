@@ -1,44 +1,130 @@
 import logging
+from collections import OrderedDict
+from itertools import islice
 from typing import List, Dict, Optional
+import numpy as np
+import orjson
+import xxhash
 
 logger = logging.getLogger(__name__)
 
+class BoundedOrderedDict(OrderedDict):
+    """
+    OrderedDict that drops its oldest entries beyond maxlen, like deque(maxlen=N)
+    """
+    def __init__(self, maxlen: int):
+        super().__init__()
+        self.maxlen = maxlen
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if len(self) > self.maxlen:
+            self.popitem(last=False)
+
 class MemoryContextManager:
-    def __init__(self, max_context_size: int = 10):
-        self.context_window = []
+    def __init__(self, max_context_size: int = 10, embeddings=None):
+        # Keyed by a canonical content hash so dedup and trimming are O(1) per message
+        self._window = BoundedOrderedDict(maxlen=max_context_size)
         self.max_context_size = max_context_size
-        
+        self.embeddings = embeddings
+        # One pre-allocated int8 row per window slot plus its dequantization
+        # scale, allocated on first embedding
+        self._emb: Optional[np.ndarray] = None
+        self._row_scale: Optional[np.ndarray] = None
+        self._slots: Dict[bytes, int] = {}
+        self._free_slots: List[int] = []
+
+    @property
+    def context_window(self) -> List[Dict]:
+        return list(self._window.values())
+
     async def manage_context(self, messages: List[Dict]) -> List[Dict]:
         """
         Manages the context window for memory operations
         """
         try:
-            # Add new messages to context
-            self.context_window.extend(messages)
-            
-            # Trim context if it exceeds max size
-            if len(self.context_window) > self.max_context_size:
-                self.context_window = self.context_window[-self.max_context_size:]
-                
-            # Remove duplicates while preserving order
-            seen = set()
-            deduplicated_context = []
-            for msg in self.context_window:
-                msg_hash = hash(str(msg))
-                if msg_hash not in seen:
-                    seen.add(msg_hash)
-                    deduplicated_context.append(msg)
-                    
-            self.context_window = deduplicated_context
+            for msg in messages:
+                msg_key = self._message_key(msg)
+                # Re-adding a duplicate moves it to the most recent position
+                self._window.pop(msg_key, None)
+                self._window[msg_key] = msg
+
+            if self.embeddings is not None:
+                await self._index_embeddings()
+
             return self.context_window
-            
+
         except Exception as e:
             logger.error(f"Error in context management: {str(e)}")
             return messages
-            
+
     async def get_relevant_context(self, query: str, limit: int = 5) -> List[Dict]:
         """
         Retrieves relevant context based on query
         """
-        # Implement relevance scoring and filtering
-        return self.context_window[:limit]
\ No newline at end of file
+        if self.embeddings is None or not self._slots or not query:
+            return list(islice(self._window.values(), limit))
+
+        try:
+            query_vector, query_scale = self._quantize(
+                np.asarray([await self.embeddings.aembed_query(query)], dtype=np.float32)
+            )
+            # Snapshot the slots only after the await; _index_embeddings may
+            # have reused or freed rows in the meantime
+            keys = list(self._slots)
+            rows = np.fromiter((self._slots[k] for k in keys), dtype=np.intp, count=len(keys))
+            # Integer dot products rescaled per row; embeddings are unit length,
+            # so this approximates cosine similarity
+            dots = self._emb[rows].astype(np.int32) @ query_vector[0].astype(np.int32)
+            scores = dots * self._row_scale[rows] * query_scale[0]
+
+            if limit < len(keys):
+                top = np.argpartition(-scores, limit)[:limit]
+                top = top[np.argsort(-scores[top])]
+            else:
+                top = np.argsort(-scores)
+            return [self._window[keys[i]] for i in top]
+
+        except Exception as e:
+            logger.error(f"Error in context relevance scoring: {str(e)}")
+            return list(islice(self._window.values(), limit))
+
+    async def _index_embeddings(self):
+        """
+        Embeds messages new to the window into slots freed by evicted ones
+        """
+        for key in [k for k in self._slots if k not in self._window]:
+            self._free_slots.append(self._slots.pop(key))
+
+        new_keys = [k for k in self._window if k not in self._slots]
+        if not new_keys:
+            return
+
+        texts = [str(self._window[k].get('content', self._window[k])) for k in new_keys]
+        vectors, scales = self._quantize(
+            np.asarray(await self.embeddings.aembed_documents(texts), dtype=np.float32)
+        )
+        if self._emb is None:
+            self._emb = np.zeros((self.max_context_size, vectors.shape[1]), dtype=np.int8)
+            self._row_scale = np.zeros(self.max_context_size, dtype=np.float32)
+
+        for key, vector, scale in zip(new_keys, vectors, scales):
+            slot = self._free_slots.pop() if self._free_slots else len(self._slots)
+            self._slots[key] = slot
+            self._emb[slot] = vector
+            self._row_scale[slot] = scale
+
+    @staticmethod
+    def _quantize(vectors: np.ndarray):
+        """
+        Symmetric per-row int8 quantization, returning codes and scales
+        """
+        scales = np.abs(vectors).max(axis=1) / 127
+        scales[scales == 0] = 1
+        codes = np.round(vectors / scales[:, None]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    @staticmethod
+    def _message_key(msg: Dict) -> bytes:
+        payload = orjson.dumps(msg, option=orjson.OPT_SORT_KEYS, default=str)
+        return xxhash.xxh3_128(payload).digest()
\ No newline at end of file
@@ -1,27 +1,126 @@
+from functools import partial
+from typing import Dict, List, Optional
+import anyio
+import numpy as np
+from .base_classes import MessageBatch
+from .memory_summarizer import MemorySummarizer
+
 class MemoryMaintenance:
     def __init__(self, config: Dict):
         self.mem0 = config['mem0']
         self.summarizer = MemorySummarizer(config.get('llm'))
-        
-    async def cleanup_memories(self, age_days: Optional[int] = 30):
-        old_memories = await self.mem0.search(
-            filters={"age_days": age_days}
-        )
-        
+        # Per-user rolling summary state: summary, original_count and
+        # last_summarized_timestamp. Summarized memories are deleted by cleanup,
+        # so the rolling summary is the only record of them and each run must
+        # build on it rather than start over. Loaded from the stored summaries
+        # on first use so restarts and other workers pick it up
+        self.summary_state: Dict[Optional[str], Dict] = {}
+
+    async def cleanup_memories(self, age_days: Optional[int] = 30, user_id: Optional[str] = None):
+        state = await self._load_summary_state(user_id)
+
+        # Only fetch memories that aged out since the last summary
+        filters = {"age_days": age_days}
+        if user_id is not None:
+            filters["user_id"] = user_id
+        if state and state['last_summarized_timestamp'] is not None:
+            filters["timestamp__gt"] = state['last_summarized_timestamp']
+
+        old_memories = self._results(await anyio.to_thread.run_sync(partial(
+            self.mem0.search,
+            filters=filters
+        )))
+
         # Summarize old memories before cleanup
         if old_memories:
-            summary = await self.summarizer.summarize_memories(old_memories)
+            to_summarize = list(old_memories)
+            original_count = len(to_summarize)
+            if state:
+                to_summarize.insert(0, {'type': 'prior_summary', 'content': state['summary']})
+                original_count += state['original_count']
+
+            summary = await self.summarizer.summarize_memories(MessageBatch.from_messages(to_summarize))
             if summary:
-                await self.store_summary(summary)
-                
+                # Without a timestamp on the memories keep the previous watermark;
+                # falling back to now would skip memories that age out later
+                watermark = self._latest_timestamp(old_memories)
+                if watermark is None and state:
+                    watermark = state['last_summarized_timestamp']
+                summary['original_count'] = original_count
+                summary['last_summarized_timestamp'] = watermark
+                await self.store_summary(summary, user_id=user_id)
+                self.summary_state[user_id] = {
+                    'summary': summary['summary'],
+                    'original_count': original_count,
+                    'last_summarized_timestamp': watermark
+                }
+
         return await super().cleanup_memories(age_days)
-        
-    async def store_summary(self, summary: Dict):
-        await self.mem0.add(
+
+    async def store_summary(self, summary: Dict, user_id: Optional[str] = None):
+        await anyio.to_thread.run_sync(partial(
+            self.mem0.add,
             content=summary['summary'],
             metadata={
                 'type': 'memory_summary',
+                'user_id': user_id,
                 'original_count': summary['original_count'],
-                'timestamp': summary['timestamp']
+                'timestamp': summary['timestamp'],
+                'last_summarized_timestamp': summary.get('last_summarized_timestamp')
             }
-        )
\ No newline at end of file
+        ))
+
+    async def _load_summary_state(self, user_id: Optional[str]) -> Optional[Dict]:
+        """
+        Returns the user's rolling summary state, reading the latest stored summary once
+        """
+        if user_id in self.summary_state:
+            return self.summary_state[user_id]
+
+        filters = {"type": "memory_summary"}
+        if user_id is not None:
+            filters["user_id"] = user_id
+        summaries = self._results(await anyio.to_thread.run_sync(partial(
+            self.mem0.search,
+            filters=filters
+        )))
+
+        state = None
+        latest = self._latest(summaries)
+        if latest is not None:
+            metadata = latest.get('metadata') or {}
+            state = {
+                'summary': str(latest.get('content', latest.get('memory', ''))),
+                'original_count': metadata.get('original_count', 0),
+                'last_summarized_timestamp': metadata.get('last_summarized_timestamp')
+            }
+        self.summary_state[user_id] = state
+        return state
+
+    @staticmethod
+    def _results(response) -> List:
+        # mem0 returns either a list of hits or {'results': [...]}
+        if isinstance(response, dict):
+            response = response.get('results', [])
+        return list(response or [])
+
+    @staticmethod
+    def _latest(memories: List[Dict]) -> Optional[Dict]:
+        memories = [m for m in memories if isinstance(m, dict)]
+        if not memories:
+            return None
+        # Stored timestamps mix ISO strings and epoch numbers; compare them on
+        # MessageBatch's common ns scale
+        timestamps_ns = MessageBatch.from_messages(memories).timestamps_ns
+        latest = int(np.argmax(timestamps_ns))
+        if timestamps_ns[latest] == 0:
+            return None
+        return memories[latest]
+
+    @classmethod
+    def _latest_timestamp(cls, memories: List[Dict]):
+        memory = cls._latest(memories)
+        if memory is None:
+            return None
+        # The original value, not the ns one, so it matches the mem0 filter
+        return memory.get('timestamp') or (memory.get('metadata') or {}).get('timestamp')
\ No newline at end of file
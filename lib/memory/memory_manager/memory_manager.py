@@ -1,4 +1,5 @@
 import logging
+from functools import cached_property
 from typing import Dict, List, Optional
 from .memory_context_manager import MemoryContextManager
 from .memory_summarizer import MemorySummarizer
@@ -11,10 +12,55 @@ logger = logging.getLogger(__name__)
 class MemoryManager:
     def __init__(self, config: Dict):
         self.config = config
-        self.context_manager = MemoryContextManager()
+        self.context_manager = MemoryContextManager(embeddings=config.get('embeddings'))
         self.summarizer = MemorySummarizer(config.get('llm'))
-        self.compressor = MemoryCompressor()
-        self.cache = MemoryCache()
+        self.compressor = MemoryCompressor(dict_path=config.get('compression_dict_path'))
+        self.cache = MemoryCache(redis_url=config.get('redis_url'))
+
+    @cached_property
+    def search_processing(self):
+        """
+        Search pipeline that owns the semantic result cache
+        """
+        search_processing = self.config.get('search_processing')
+        if search_processing is None:
+            # Deferred so constructing the manager doesn't build the LLM and vector store clients
+            from .initialization_config import InitializationConfig
+            from .search_processing import SearchProcessing
+            search_processing = SearchProcessing(InitializationConfig(self.config))
+        return search_processing
+
+    async def add_memory(self, user_id: str, content: str, metadata: Optional[Dict] = None) -> Dict:
+        """
+        Stores a memory on behalf of a user
+        """
+        return await self.process_memory(content, {**(metadata or {}), 'user_id': user_id})
+
+    async def search_memories(self, user_id: str, query: str, limit: int = 5) -> List[Dict]:
+        """
+        Searches a user's memories
+        """
+        return await self.search_processing.search(query, filters={'user_id': user_id}, limit=limit)
+
+    async def invalidate_search_cache(self, user_id: Optional[str] = None):
+        """
+        Forgets cached search results after a user's memories change
+        """
+        # Nothing can be cached before the first search builds the pipeline
+        if 'search_processing' in self.__dict__:
+            await self.search_processing.invalidate_search_cache(user_id)
+
+    async def close(self):
+        """
+        Stops the embedding batchers' background workers
+        """
+        embeddings = [self.context_manager.embeddings]
+        if 'search_processing' in self.__dict__:
+            embeddings.append(self.search_processing.embeddings)
+        for embedder in embeddings:
+            batcher = getattr(embedder, 'batcher', None)
+            if batcher is not None:
+                await batcher.close()
         
     async def process_memory(self, content: str, metadata: Dict) -> Dict:
         """
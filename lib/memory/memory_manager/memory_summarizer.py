@@ -1,35 +1,51 @@
 import logging
-from typing import List, Dict, Optional
+from datetime import datetime, timezone
+from functools import partial
+from typing import List, Dict, Optional, Union
+import anyio
+from .base_classes import MessageBatch
 
 logger = logging.getLogger(__name__)
 
+# Built once at import; the memories travel in the user message, so the
+# prompt needs no {memories} placeholder
+SUMMARY_SYSTEM_PROMPT = """Summarize the memories provided by the user while preserving key information.
+
+Provide a concise summary that captures:
+1. Main topics/themes
+2. Key entities and relationships
+3. Important temporal information
+"""
+
 class MemorySummarizer:
+    SYSTEM_PROMPT = SUMMARY_SYSTEM_PROMPT
+
     def __init__(self, llm):
         self.llm = llm
         
-    async def summarize_memories(self, memories: List[Dict]) -> Dict:
+    async def summarize_memories(self, memories: Union[List[Dict], MessageBatch]) -> Dict:
         """
         Summarizes a collection of memories into a condensed format
         """
         try:
-            summary_prompt = """
-            Summarize the following memories while preserving key information:
-            {memories}
+            if isinstance(memories, MessageBatch):
+                # Read the columns directly instead of repr-ing each dict; the
+                # timestamp prefix carries the temporal information the prompt asks for
+                formatted_memories = "\n".join(
+                    f"[{self._format_timestamp(ts)}] {content}" if ts else content
+                    for content, ts in zip(memories.contents, memories.timestamps_ns.tolist())
+                )
+            else:
+                formatted_memories = "\n".join([str(m) for m in memories])
             
-            Provide a concise summary that captures:
-            1. Main topics/themes
-            2. Key entities and relationships
-            3. Important temporal information
-            """
-            
-            formatted_memories = "\n".join([str(m) for m in memories])
-            
-            summary = await self.llm.generate_response(
+            # mem0 LLM clients are synchronous; keep the request off the event loop
+            summary = await anyio.to_thread.run_sync(partial(
+                self.llm.generate_response,
                 messages=[
-                    {"role": "system", "content": summary_prompt},
+                    {"role": "system", "content": self.SYSTEM_PROMPT},
                     {"role": "user", "content": formatted_memories}
                 ]
-            )
+            ))
             
             return {
                 "original_count": len(memories),
@@ -41,6 +57,9 @@ class MemorySummarizer:
             logger.error(f"Error in memory summarization: {str(e)}")
             return None
             
+    @staticmethod
+    def _format_timestamp(timestamp_ns: int) -> str:
+        return datetime.fromtimestamp(timestamp_ns / 1_000_000_000, tz=timezone.utc).isoformat(timespec='seconds')
+            
     def _get_current_timestamp(self):
-        from datetime import datetime
         return datetime.utcnow().isoformat()
\ No newline at end of file
@@ -1,29 +1,138 @@
-from typing import Dict, List
+import asyncio
+import json
+import logging
+from functools import partial
+import anyio
+import numpy as np
+from typing import Dict, List, Optional
 from langchain.prompts import PromptTemplate
+from .semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+
+# Parsed once at import instead of per instance
+SEARCH_PROMPT = PromptTemplate(
+    template="Search Query: {query}\nContext: {context}\nRelevant Information:",
+    input_variables=["query", "context"]
+)
 
 class SearchProcessing:
     def __init__(self, config: Dict):
         self.mem0 = config.mem0
         self.vector_store = config.vector_store
-        self.search_prompt = PromptTemplate(
-            template="Search Query: {query}\nContext: {context}\nRelevant Information:",
-            input_variables=["query", "context"]
-        )
+        self.embeddings = config.embeddings
+        settings = getattr(config, 'config', {})
+        # Index default ef, sent explicitly so it can be raised to the requested limit
+        self.hnsw_ef = settings.get('hnsw_ef', 64) if settings.get('index_type', 'HNSW') == 'HNSW' else None
+        self.semantic_cache = SemanticCache()
+        self.search_prompt = SEARCH_PROMPT
         
-    async def search(self, query: str, filters: Dict = None):
+    async def search(
+        self,
+        query: str,
+        filters: Dict = None,
+        ef: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        limit: Optional[int] = None
+    ):
         """Hybrid search implementation"""
-        vector_results = await self._search_vectors(query)
-        mem0_results = await self.mem0.search(query=query, filters=filters)
+        # Embed on the loop so concurrent searches are micro-batched
+        embedding = await self.embeddings.aembed_query(query)
+        user_id = (filters or {}).get('user_id')
+        # Results are truncated to limit, so it is part of the cache scope
+        cache_scope = {'filters': filters, 'limit': limit}
+        cached_results = await self.semantic_cache.get(embedding, cache_scope)
+        if cached_results is not None:
+            return cached_results
+            
+        vector_results, mem0_results = await asyncio.gather(
+            self._search_vectors(embedding, ef, nprobe, user_id=user_id, limit=limit),
+            anyio.to_thread.run_sync(partial(self.mem0.search, query=query, filters=filters)),
+            return_exceptions=True
+        )
+        # A failing backend shouldn't sink the results of the other one
+        if isinstance(vector_results, Exception):
+            logger.error(f"Vector search error: {str(vector_results)}")
+            vector_results = []
+        if isinstance(mem0_results, Exception):
+            logger.error(f"Mem0 search error: {str(mem0_results)}")
+            mem0_results = []
         
-        combined_results = self._merge_results(vector_results, mem0_results)
-        return self._rank_results(combined_results, query)
+        combined_results = self._merge_results(vector_results, mem0_results, limit=limit)
+        ranked_results = self._rank_results(combined_results, query)
+        await self.semantic_cache.set(embedding, cache_scope, ranked_results, user_id=user_id)
+        return ranked_results
+
+    async def invalidate_search_cache(self, user_id: Optional[str] = None):
+        """
+        Forgets cached search results after a user's memories change
+        """
+        await self.semantic_cache.invalidate(user_id)
         
-    async def _search_vectors(self, query: str):
-        return self.vector_store.similarity_search(query)
+    async def _search_vectors(
+        self,
+        embedding: List[float],
+        ef: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        user_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ):
+        if self.hnsw_ef is not None:
+            # HNSW rejects searches with ef below k, the index default included
+            ef = max(ef or self.hnsw_ef, limit or 0)
+        # A larger HNSW ef or IVF nprobe trades latency for recall on this query only
+        params = {k: v for k, v in (("ef", ef), ("nprobe", nprobe)) if v}
+        param = {"metric_type": "IP", "params": params} if params else None
+        return await anyio.to_thread.run_sync(partial(
+            self.vector_store.similarity_search_by_vector,
+            embedding,
+            # Fetch enough candidates for the vector side to fill the limit
+            **({"k": limit} if limit else {}),
+            param=param,
+            # Filter inside Milvus so the top-k is not spent on other users' memories
+            expr=f"user_id == {json.dumps(str(user_id))}" if user_id is not None else None
+        ))
         
-    def _merge_results(self, vector_results: List, mem0_results: List):
-        # Implement Mem0's merging logic
-        return self.mem0.utils.merge_results(vector_results, mem0_results)
+    def _merge_results(
+        self,
+        vector_results: List,
+        mem0_results: List,
+        limit: Optional[int] = None,
+        rrf_k: int = 60
+    ):
+        """
+        Reciprocal Rank Fusion of both result lists, deduplicated by content
+        """
+        if isinstance(mem0_results, dict):
+            mem0_results = mem0_results.get('results', [])
+        results = list(vector_results) + list(mem0_results)
+        if not results:
+            return []
+
+        # Rank within each source, starting at 1
+        ranks = np.concatenate([
+            np.arange(1, len(vector_results) + 1),
+            np.arange(1, len(mem0_results) + 1)
+        ])
+        keys = np.array([self._result_content(r) for r in results], dtype=object)
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        scores = np.zeros(len(first))
+        np.add.at(scores, inverse, 1.0 / (rrf_k + ranks))
+
+        if limit is not None and limit < len(scores):
+            # Only the top limit need ordering: O(n) select, then sort limit items
+            order = np.argpartition(-scores, limit)[:limit]
+            order = order[np.argsort(-scores[order], kind='stable')]
+        else:
+            order = np.argsort(-scores, kind='stable')
+        return [results[first[i]] for i in order]
+
+    @staticmethod
+    def _result_content(result) -> str:
+        # LangChain Documents from the vectorstore, dicts from mem0
+        if isinstance(result, dict):
+            return str(result.get('memory', result.get('content', '')))
+        return str(getattr(result, 'page_content', result))
         
     def _rank_results(self, results: List, query: str):
         # Implement Mem0's ranking system
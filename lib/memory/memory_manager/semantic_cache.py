@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+import orjson
+import xxhash
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """
+    Returns stored results for queries whose embedding is near a cached query
+    """
+    def __init__(self, max_size: int = 1024, threshold: float = 0.97, ttl_seconds: int = 60):
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl_ns = ttl_seconds * 1_000_000_000
+        # Fixed-size ring of cached query embeddings; the oldest entry is
+        # overwritten once full. Allocated on first insert
+        self._matrix: Optional[np.ndarray] = None
+        self._scopes = np.zeros(max_size, dtype=np.uint64)
+        # Owning user per entry so writes can invalidate that user's results
+        self._users = np.zeros(max_size, dtype=np.uint64)
+        self._valid = np.zeros(max_size, dtype=bool)
+        self._created_ns = np.zeros(max_size, dtype=np.int64)
+        self._results: List[Any] = [None] * max_size
+        self._next = 0
+        self._count = 0
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    async def get(self, embedding: List[float], scope: Optional[Dict] = None) -> Optional[Any]:
+        """
+        Looks up results cached for a near-duplicate query within the same scope
+        """
+        try:
+            async with self._lock:
+                if self._count == 0:
+                    self.misses += 1
+                    return None
+                query = np.asarray(embedding, dtype=np.float32)
+                # Embeddings are unit length, so this is cosine similarity
+                scores = self._matrix[:self._count] @ query
+                stale = (
+                    ~self._valid[:self._count]
+                    | (self._scopes[:self._count] != self._scope_id(scope))
+                    | (time.monotonic_ns() - self._created_ns[:self._count] > self.ttl_ns)
+                )
+                scores[stale] = -np.inf
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self.hits += 1
+                    return self._results[best]
+                self.misses += 1
+                return None
+
+        except Exception as e:
+            logger.error(f"Semantic cache retrieval error: {str(e)}")
+            return None
+
+    async def set(
+        self,
+        embedding: List[float],
+        scope: Optional[Dict],
+        results: Any,
+        user_id: Optional[str] = None
+    ) -> bool:
+        """
+        Caches results under the query embedding, evicting the oldest entry when full
+        """
+        try:
+            async with self._lock:
+                vector = np.asarray(embedding, dtype=np.float32)
+                if self._matrix is None:
+                    self._matrix = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+                slot = self._next
+                self._matrix[slot] = vector
+                self._scopes[slot] = self._scope_id(scope)
+                self._users[slot] = self._user_id(user_id)
+                self._valid[slot] = True
+                self._created_ns[slot] = time.monotonic_ns()
+                self._results[slot] = results
+                self._next = (slot + 1) % self.max_size
+                self._count = min(self._count + 1, self.max_size)
+            return True
+
+        except Exception as e:
+            logger.error(f"Semantic cache storage error: {str(e)}")
+            return False
+
+    async def invalidate(self, user_id: Optional[str] = None):
+        """
+        Drops cached results for a user, or every entry when no user is given
+        """
+        async with self._lock:
+            if user_id is None:
+                self._valid[:] = False
+            else:
+                self._valid[self._users == self._user_id(user_id)] = False
+
+    @staticmethod
+    def _user_id(user_id: Optional[str]) -> int:
+        # 0 marks entries stored without a user
+        return xxhash.xxh3_64_intdigest(str(user_id).encode('utf-8')) if user_id is not None else 0
+
+    @staticmethod
+    def _scope_id(scope: Optional[Dict]) -> int:
+        return xxhash.xxh3_64_intdigest(orjson.dumps(scope or {}, option=orjson.OPT_SORT_KEYS, default=str))
@@ -1,8 +1,23 @@
+import logging
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, Iterable, List, Optional
+import anyio
+import xxhash
+from .memory_compressor import MemoryCompressor
+
+logger = logging.getLogger(__name__)
+
 class StorageOperations:
     def __init__(self, config: Dict):
         self.mem0 = config['mem0']
         self.vector_store = config['vector_store']
-        self.compressor = MemoryCompressor()
+        self.compressor = MemoryCompressor(dict_path=config.get('compression_dict_path'))
+        # (user_id, vector id) of recently ingested memories, least recently
+        # used first, so retried or repeated writes skip both the embedding
+        # request and the insert
+        self._ingested: OrderedDict = OrderedDict()
+        self.ingest_cache_size = config.get('ingest_cache_size', 10000)
         
     async def store_memory(self, content: str, metadata: Dict):
         try:
@@ -20,4 +35,79 @@ class StorageOperations:
             
         except Exception as e:
             logger.error(f"Storage error: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+            
+    async def store_memories(self, memories: List[Dict]):
+        """
+        Stores a batch of memories with a single embedding request and insert
+        """
+        try:
+            keys = [self._ingest_key(m) for m in memories]
+            # Snapshot before awaiting; concurrent batches may evict entries
+            known = {}
+            for key in keys:
+                if key in self._ingested:
+                    self._ingested.move_to_end(key)
+                    known[key] = self._ingested[key][1]
+            # First position of each new memory, deduplicated within the batch
+            pending: Dict[bytes, int] = {}
+            for i, key in enumerate(keys):
+                if key not in known:
+                    pending.setdefault(key, i)
+
+            if pending:
+                new_ids = await anyio.to_thread.run_sync(partial(
+                    self.vector_store.add_texts,
+                    texts=[memories[i]['content'] for i in pending.values()],
+                    metadatas=[memories[i].get('metadata', {}) for i in pending.values()]
+                ))
+                for key, vector_id in zip(pending, new_ids):
+                    known[key] = vector_id
+                    self._ingested[key] = (self._memory_user(memories[pending[key]]), vector_id)
+                    if len(self._ingested) > self.ingest_cache_size:
+                        self._ingested.popitem(last=False)
+
+            ids = [known[key] for key in keys]
+            return ids
+            
+        except Exception as e:
+            logger.error(f"Batch storage error: {str(e)}")
+            raise
+            
+    async def delete_memory(self, memory_id: str, **kwargs):
+        result = await super().delete_memory(memory_id, **kwargs)
+        self.forget_ingested(vector_ids=[memory_id])
+        return result
+        
+    async def cleanup_memories(self, age_days: Optional[int] = 30, user_id: Optional[str] = None):
+        result = await super().cleanup_memories(age_days)
+        # Cleanup doesn't report which memories it removed, so forget the
+        # user's entries (all of them without a user) rather than return dead ids
+        self.forget_ingested(user_id=user_id)
+        return result
+        
+    def forget_ingested(self, user_id: Optional[str] = None, vector_ids: Optional[Iterable[str]] = None):
+        """
+        Drops dedup entries for deleted memories so re-adding them stores them again
+        """
+        if user_id is None and vector_ids is None:
+            self._ingested.clear()
+            return
+        vector_ids = set(vector_ids or ())
+        stale = [
+            key for key, (owner, vector_id) in self._ingested.items()
+            if vector_id in vector_ids or (user_id is not None and owner == str(user_id))
+        ]
+        for key in stale:
+            del self._ingested[key]
+            
+    @staticmethod
+    def _memory_user(memory: Dict) -> str:
+        return str((memory.get('metadata') or {}).get('user_id', ''))
+            
+    @staticmethod
+    def _ingest_key(memory: Dict) -> bytes:
+        # Scoped by user so identical content from different users is still stored
+        user_id = StorageOperations._memory_user(memory)
+        content = ' '.join(str(memory['content']).split())
+        return xxhash.xxh3_128(f"{user_id}\0{content}".encode('utf-8')).digest()
\ No newline at end of file
@@ -1,11 +1,34 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from functools import partial
+from itertools import chain
 from typing import List, Dict, Optional
 from datetime import datetime
+import anyio
+from diskcache import Cache
 from .memory_manager import MemoryManager
 from .config import DEFAULT_CONFIG
 
+logger = logging.getLogger(__name__)
+
 class MemoryService:
-    def __init__(self, config: Dict = DEFAULT_CONFIG):
+    def __init__(
+        self,
+        config: Dict = DEFAULT_CONFIG,
+        cache_dir: Optional[str] = None,
+        cache_ttl: int = 60
+    ):
         self.memory_manager = MemoryManager(config)
+        # Short-lived search results shared across workers and restarts,
+        # tagged by user so writes can invalidate them
+        self.search_cache = Cache(
+            cache_dir or config.get("search_cache_dir") or self._default_cache_dir(),
+            tag_index=True
+        )
+        self.cache_ttl = cache_ttl
 
     async def add_user_memory(
         self,
@@ -17,12 +40,17 @@ class MemoryService:
             metadata = {}
         
         metadata["timestamp"] = datetime.now().isoformat()
+        # Integer epoch for cheap sorting and range filters
+        metadata["timestamp_ns"] = time.time_ns()
         
         await self.memory_manager.add_memory(
             user_id=user_id,
             content=content,
             metadata=metadata
         )
+        # diskcache does blocking SQLite and file I/O; keep it off the event loop
+        await anyio.to_thread.run_sync(self.search_cache.evict, user_id)
+        await self.memory_manager.invalidate_search_cache(user_id)
 
     async def retrieve_memories(
         self,
@@ -30,11 +58,23 @@ class MemoryService:
         query: str,
         limit: int = 5
     ):
+        cache_key = (user_id, hashlib.blake2b(query.encode('utf-8'), digest_size=16).hexdigest(), limit)
+        cached = await anyio.to_thread.run_sync(self.search_cache.get, cache_key)
+        if cached is not None:
+            return cached
+
         results = await self.memory_manager.search_memories(
             user_id=user_id,
             query=query,
             limit=limit
         )
+        await anyio.to_thread.run_sync(partial(
+            self.search_cache.set,
+            cache_key,
+            results,
+            expire=self.cache_ttl,
+            tag=user_id
+        ))
         return results
 
     async def get_context(
@@ -43,23 +83,43 @@ class MemoryService:
         query: str,
         limit: int = 5
     ):
-        # Get vector search results
-        vector_results = await self.memory_manager.search_memories(
-            user_id=user_id,
-            query=query,
-            limit=limit
+        # Vector search and graph lookup are independent, run them concurrently
+        vector_results, graph_results = await asyncio.gather(
+            self.memory_manager.search_memories(
+                user_id=user_id,
+                query=query,
+                limit=limit
+            ),
+            self.memory_manager.get_related_memories(
+                user_id=user_id,
+                content=query
+            ),
+            return_exceptions=True
         )
+        # A failing backend shouldn't sink the results of the other one
+        if isinstance(vector_results, Exception):
+            logger.error(f"Vector context search error: {str(vector_results)}")
+            vector_results = []
+        if isinstance(graph_results, Exception):
+            logger.error(f"Related memories lookup error: {str(graph_results)}")
+            graph_results = []
 
-        # Get related memories from graph
-        graph_results = await self.memory_manager.get_related_memories(
-            user_id=user_id,
-            content=query
-        )
+        # Combine and deduplicate results in one pass, vector hits first
+        seen = set()
+        all_memories = []
+        for r in chain(vector_results, graph_results):
+            if r.id not in seen:
+                seen.add(r.id)
+                all_memories.append(r)
+
+        return all_memories
 
-        # Combine and deduplicate results
-        all_memories = {
-            **{r.id: r for r in vector_results},
-            **{r.id: r for r in graph_results}
-        }
+    async def close(self):
+        await self.memory_manager.close()
+        await anyio.to_thread.run_sync(self.search_cache.close)
 
-        return list(all_memories.values())
\ No newline at end of file
+    @staticmethod
+    def _default_cache_dir() -> str:
+        # Per-user location so the service runs without root
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, "aivy", "memsearch")
\ No newline at end of file
@@ -0,0 +1,41 @@
+import importlib
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+MEMORY_DIR = Path(__file__).resolve().parent.parent / "lib" / "memory"
+MEMORY_MANAGER_DIR = MEMORY_DIR / "memory_manager"
+
+def load_memory_module(name: str):
+    """
+    Imports a single memory_manager module by path, without running the
+    package __init__ that pulls in the LangChain and mem0 clients
+    """
+    module_name = f"memory_manager_{name}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, MEMORY_MANAGER_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def load_memory_service():
+    """
+    Imports memory_service with its relative imports resolved against stand-in
+    packages: the memory_manager package __init__ and config.py are skipped, so
+    callers pass the config (and its clients) explicitly
+    """
+    if "memory_pkg.memory_service" in sys.modules:
+        return sys.modules["memory_pkg.memory_service"]
+    for name, path in (("memory_pkg", MEMORY_DIR), ("memory_pkg.memory_manager", MEMORY_MANAGER_DIR)):
+        package = types.ModuleType(name)
+        package.__path__ = [str(path)]
+        sys.modules[name] = package
+    config = types.ModuleType("memory_pkg.config")
+    config.DEFAULT_CONFIG = {}
+    sys.modules["memory_pkg.config"] = config
+    manager = importlib.import_module("memory_pkg.memory_manager.memory_manager")
+    sys.modules["memory_pkg.memory_manager"].MemoryManager = manager.MemoryManager
+    return importlib.import_module("memory_pkg.memory_service")
\ No newline at end of file
@@ -0,0 +1,45 @@
+import asyncio
+from conftest import load_memory_module
+
+MemoryCache = load_memory_module("memory_cache").MemoryCache
+
+class InMemoryRedis:
+    """
+    Minimal stand-in for the redis.asyncio get/set calls MemoryCache makes
+    """
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+class Document:
+    def __init__(self, page_content):
+        self.page_content = page_content
+
+def make_cache(l2):
+    cache = MemoryCache()
+    cache._l2 = l2
+    return cache
+
+def test_json_results_are_shared_through_l2():
+    async def run():
+        l2 = InMemoryRedis()
+        await make_cache(l2).cache_memory("q", [{"content": "a", "score": 0.5}])
+        # A second process with an empty L1 reads it back from L2
+        assert await make_cache(l2).get_cached_memory("q") == [{"content": "a", "score": 0.5}]
+    asyncio.run(run())
+
+def test_non_json_results_stay_in_l1():
+    async def run():
+        l2 = InMemoryRedis()
+        cache = make_cache(l2)
+        docs = [Document("a")]
+        assert await cache.cache_memory("q", docs)
+        assert await cache.get_cached_memory("q") is docs
+        assert l2.store == {}
+        assert await make_cache(l2).get_cached_memory("q") is None
+    asyncio.run(run())
\ No newline at end of file
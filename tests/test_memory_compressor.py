@@ -0,0 +1,70 @@
+import asyncio
+import zlib
+import orjson
+import zstandard
+from conftest import load_memory_module
+
+MemoryCompressor = load_memory_module("memory_compressor").MemoryCompressor
+
+def make_memories(start: int, count: int):
+    return [
+        {
+            "content": f"User {i % 7} mentioned they study topic {i} on weekday {i % 5}",
+            "metadata": {"user_id": f"user-{i % 7}", "timestamp": 1700000000 + i, "type": "chat"}
+        }
+        for i in range(start, start + count)
+    ]
+
+def compress(compressor, memories):
+    return asyncio.run(compressor.compress_memories(memories))
+
+def decompress(compressor, data):
+    return asyncio.run(compressor.decompress_memories(data))
+
+def test_round_trip_across_instances_with_trained_dictionary(tmp_path):
+    dict_path = str(tmp_path / "memories.zdict")
+    compressor = MemoryCompressor(dict_path=dict_path, dict_size=4096, training_samples=200)
+
+    compress(compressor, make_memories(0, 200))
+    assert compressor._dict is not None
+
+    memories = make_memories(200, 5)
+    result = compress(compressor, memories)
+    assert zstandard.get_frame_parameters(result["compressed_data"]).dict_id == compressor._dict.dict_id()
+
+    # A fresh instance, as after a restart, must load the persisted dictionary
+    restarted = MemoryCompressor(dict_path=dict_path)
+    assert decompress(restarted, result["compressed_data"]) == memories
+
+def test_no_dictionary_is_trained_without_dict_path():
+    compressor = MemoryCompressor(dict_size=4096, training_samples=200)
+    compress(compressor, make_memories(0, 200))
+    assert compressor._dict is None
+
+    memories = make_memories(200, 5)
+    result = compress(compressor, memories)
+    assert decompress(MemoryCompressor(), result["compressed_data"]) == memories
+
+def test_second_instance_adopts_already_published_dictionary(tmp_path):
+    dict_path = str(tmp_path / "memories.zdict")
+    first = MemoryCompressor(dict_path=dict_path, dict_size=4096, training_samples=200)
+    second = MemoryCompressor(dict_path=dict_path, dict_size=4096, training_samples=200)
+
+    compress(first, make_memories(0, 200))
+    compress(second, make_memories(1000, 200))
+    assert first._dict.dict_id() == second._dict.dict_id()
+
+def test_instance_created_before_publication_reads_the_new_dictionary(tmp_path):
+    dict_path = str(tmp_path / "memories.zdict")
+    reader = MemoryCompressor(dict_path=dict_path)
+    writer = MemoryCompressor(dict_path=dict_path, dict_size=4096, training_samples=200)
+
+    compress(writer, make_memories(0, 200))
+    memories = make_memories(200, 5)
+    result = compress(writer, memories)
+    assert decompress(reader, result["compressed_data"]) == memories
+
+def test_decompresses_legacy_zlib_payload():
+    memories = make_memories(0, 3)
+    legacy = zlib.compress(orjson.dumps(memories))
+    assert decompress(MemoryCompressor(), legacy) == memories
\ No newline at end of file
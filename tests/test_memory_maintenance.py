@@ -0,0 +1,60 @@
+import asyncio
+import importlib
+from conftest import load_memory_service
+
+load_memory_service()
+MemoryMaintenance = importlib.import_module("memory_pkg.memory_manager.memory_maintenance").MemoryMaintenance
+
+class Storage:
+    async def cleanup_memories(self, age_days=30, user_id=None):
+        return True
+
+class Maintenance(MemoryMaintenance, Storage):
+    pass
+
+class Mem0:
+    """
+    Minimal stand-in for the mem0 search/add calls maintenance makes; search
+    answers in the {'results': [...]} shape
+    """
+    def __init__(self, memories):
+        self.memories = memories
+        self.searches = []
+
+    def search(self, filters=None):
+        self.searches.append(filters)
+        return {"results": [
+            m for m in self.memories
+            if m["metadata"].get("type") == filters.get("type")
+            and m["metadata"].get("user_id") == filters.get("user_id")
+            and ("timestamp__gt" not in filters or m["metadata"]["timestamp"] > filters["timestamp__gt"])
+        ]}
+
+    def add(self, content, metadata):
+        self.memories.append({"memory": content, "metadata": metadata})
+
+class LLM:
+    def __init__(self):
+        self.prompts = []
+
+    def generate_response(self, messages):
+        self.prompts.append(messages[-1]["content"])
+        return f"summary {len(self.prompts)}"
+
+def make_maintenance(mem0, llm):
+    return Maintenance({"mem0": mem0, "llm": llm})
+
+def test_new_instance_builds_on_the_stored_summary():
+    mem0 = Mem0([{"memory": "likes tea", "metadata": {"user_id": "u", "timestamp": 1700000000}}])
+    asyncio.run(make_maintenance(mem0, LLM()).cleanup_memories(user_id="u"))
+    stored = mem0.memories[-1]["metadata"]
+    assert stored["type"] == "memory_summary" and stored["user_id"] == "u"
+    assert stored["original_count"] == 1 and stored["last_summarized_timestamp"] == 1700000000
+
+    # As after a restart: the state comes from the stored summary, not memory
+    mem0.memories.append({"memory": "likes coffee", "metadata": {"user_id": "u", "timestamp": 1700000100}})
+    llm = LLM()
+    asyncio.run(make_maintenance(mem0, llm).cleanup_memories(user_id="u"))
+    assert mem0.searches[-1]["timestamp__gt"] == 1700000000
+    assert "summary 1" in llm.prompts[0] and "likes coffee" in llm.prompts[0]
+    assert mem0.memories[-1]["metadata"]["original_count"] == 2
\ No newline at end of file
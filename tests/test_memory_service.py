@@ -0,0 +1,61 @@
+import asyncio
+import importlib
+from types import SimpleNamespace
+from conftest import load_memory_service
+
+MemoryService = load_memory_service().MemoryService
+SearchProcessing = importlib.import_module("memory_pkg.memory_manager.search_processing").SearchProcessing
+
+class Embeddings:
+    async def aembed_query(self, query):
+        return [1.0, 0.0, 0.0]
+
+class Mem0:
+    """
+    Minimal stand-in for the mem0 search and ranking calls SearchProcessing makes
+    """
+    def __init__(self):
+        self.searches = 0
+        self.utils = SimpleNamespace(rank_results=lambda results, query: results)
+
+    def search(self, query, filters=None):
+        self.searches += 1
+        return {"results": [{"memory": f"fact {self.searches}"}]}
+
+class VectorStore:
+    def similarity_search_by_vector(self, embedding, k=4, param=None, expr=None):
+        return []
+
+def test_adding_a_memory_invalidates_the_users_cached_searches(tmp_path):
+    async def run():
+        mem0 = Mem0()
+        search_processing = SearchProcessing(SimpleNamespace(
+            mem0=mem0,
+            vector_store=VectorStore(),
+            embeddings=Embeddings()
+        ))
+        service = MemoryService({"search_processing": search_processing}, cache_dir=str(tmp_path))
+
+        assert await service.retrieve_memories("u", "what do I study?") == [{"memory": "fact 1"}]
+        assert await service.retrieve_memories("u", "what do I study?") == [{"memory": "fact 1"}]
+        assert mem0.searches == 1
+
+        await service.add_user_memory("u", "I study chemistry")
+        # Both the service's disk cache and the semantic cache behind it were dropped
+        assert await service.retrieve_memories("u", "what do I study?") == [{"memory": "fact 2"}]
+        assert mem0.searches == 2
+    asyncio.run(run())
+
+class Batcher:
+    closed = False
+
+    async def close(self):
+        self.closed = True
+
+def test_close_stops_the_embedding_batcher(tmp_path):
+    async def run():
+        embeddings = SimpleNamespace(batcher=Batcher())
+        service = MemoryService({"embeddings": embeddings}, cache_dir=str(tmp_path))
+        await service.close()
+        assert embeddings.batcher.closed
+    asyncio.run(run())
\ No newline at end of file
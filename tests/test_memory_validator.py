@@ -0,0 +1,20 @@
+from conftest import load_memory_module
+
+MemoryValidator = load_memory_module("memory_validator").MemoryValidator
+
+def test_accepts_valid_memory_and_keeps_extra_metadata():
+    metadata = {"timestamp": 1700000000.5, "user_id": "u", "source": "chat"}
+    result = MemoryValidator.validate_memory("hello", metadata)
+    assert result == {"is_valid": True, "content": "hello", "metadata": metadata}
+
+def test_rejects_empty_and_oversized_content():
+    metadata = {"timestamp": 1, "user_id": "u"}
+    assert not MemoryValidator.validate_memory("", metadata)["is_valid"]
+    too_long = "x" * (MemoryValidator.MAX_CONTENT_LENGTH + 1)
+    assert not MemoryValidator.validate_memory(too_long, metadata)["is_valid"]
+
+def test_rejects_missing_or_mistyped_metadata():
+    assert not MemoryValidator.validate_memory("hi", {"user_id": "u"})["is_valid"]
+    assert not MemoryValidator.validate_memory("hi", {"timestamp": "1", "user_id": "u"})["is_valid"]
+    assert not MemoryValidator.validate_memory("hi", {"timestamp": 1, "user_id": 7})["is_valid"]
+    assert not MemoryValidator.validate_memory("hi", None)["is_valid"]
\ No newline at end of file
@@ -0,0 +1,37 @@
+import asyncio
+import importlib
+from types import SimpleNamespace
+from conftest import load_memory_service
+
+load_memory_service()
+SearchProcessing = importlib.import_module("memory_pkg.memory_manager.search_processing").SearchProcessing
+
+class VectorStore:
+    def __init__(self):
+        self.params = []
+
+    def similarity_search_by_vector(self, embedding, k=4, param=None, expr=None):
+        self.params.append(param)
+        return []
+
+def make_search(settings):
+    store = VectorStore()
+    search = SearchProcessing(SimpleNamespace(mem0=None, vector_store=store, embeddings=None, config=settings))
+    return search, store
+
+def test_hnsw_ef_is_never_below_the_limit():
+    async def run():
+        search, store = make_search({"hnsw_ef": 64})
+        await search._search_vectors([1.0], limit=5)
+        await search._search_vectors([1.0], limit=100)
+        await search._search_vectors([1.0], ef=8, limit=20)
+        assert [p["params"]["ef"] for p in store.params] == [64, 100, 20]
+    asyncio.run(run())
+
+def test_ivf_searches_send_no_ef():
+    async def run():
+        search, store = make_search({"index_type": "IVF_PQ"})
+        await search._search_vectors([1.0], limit=100)
+        await search._search_vectors([1.0], nprobe=32, limit=100)
+        assert store.params == [None, {"metric_type": "IP", "params": {"nprobe": 32}}]
+    asyncio.run(run())
\ No newline at end of file
@@ -0,0 +1,54 @@
+import asyncio
+import numpy as np
+from conftest import load_memory_module
+
+SemanticCache = load_memory_module("semantic_cache").SemanticCache
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+def test_near_duplicate_query_hits_within_scope():
+    async def run():
+        cache = SemanticCache(threshold=0.95)
+        await cache.set(unit(1, 0, 0), {"user_id": "a"}, ["hit"], user_id="a")
+        assert await cache.get(unit(1, 0.05, 0), {"user_id": "a"}) == ["hit"]
+        assert await cache.get(unit(0, 1, 0), {"user_id": "a"}) is None
+        assert await cache.get(unit(1, 0, 0), {"user_id": "b"}) is None
+        assert cache.hits == 1 and cache.misses == 2
+    asyncio.run(run())
+
+def test_entries_expire_after_ttl():
+    async def run():
+        cache = SemanticCache(ttl_seconds=0)
+        await cache.set(unit(1, 0), None, ["hit"])
+        await asyncio.sleep(0.001)
+        assert await cache.get(unit(1, 0), None) is None
+    asyncio.run(run())
+
+def test_invalidate_drops_only_that_users_entries():
+    async def run():
+        cache = SemanticCache()
+        await cache.set(unit(1, 0), {"user_id": "a"}, ["a"], user_id="a")
+        await cache.set(unit(1, 0), {"user_id": "b"}, ["b"], user_id="b")
+        await cache.invalidate("a")
+        assert await cache.get(unit(1, 0), {"user_id": "a"}) is None
+        assert await cache.get(unit(1, 0), {"user_id": "b"}) == ["b"]
+
+        # A fresh write after invalidation is served again
+        await cache.set(unit(1, 0), {"user_id": "a"}, ["a2"], user_id="a")
+        assert await cache.get(unit(1, 0), {"user_id": "a"}) == ["a2"]
+
+        await cache.invalidate()
+        assert await cache.get(unit(1, 0), {"user_id": "b"}) is None
+    asyncio.run(run())
+
+def test_oldest_entry_is_overwritten_when_full():
+    async def run():
+        cache = SemanticCache(max_size=2)
+        await cache.set(unit(1, 0, 0), None, ["x"])
+        await cache.set(unit(0, 1, 0), None, ["y"])
+        await cache.set(unit(0, 0, 1), None, ["z"])
+        assert await cache.get(unit(1, 0, 0), None) is None
+        assert await cache.get(unit(0, 0, 1), None) == ["z"]
+    asyncio.run(run())
\ No newline at end of file